@@ -0,0 +1,169 @@
+import json
+from pathlib import Path
+
+
+def normalize_author_name(s: str) -> str:
+    """Convert a single BibTeX author name to `firstname(s) lastname` format."""
+    if "," in s:
+        split_names = s.split(",", 1)
+        last_name = split_names[0].strip()
+        first_names = [i.strip() for i in split_names[1].split()]
+    else:
+        split_names = s.split()
+        last_name = split_names.pop()
+        first_names = [i.replace(".", ". ").strip() for i in split_names]
+
+    if last_name in ["jnr", "jr", "junior"]:
+        last_name = first_names.pop()
+
+    for item in first_names:
+        if item in ["ben", "van", "der", "de", "la", "le"]:
+            last_name = first_names.pop() + " " + last_name
+
+    return " ".join(first_names) + " " + last_name
+
+
+def _split_name(name: str):
+    """Split a normalized name into its list of first name tokens and its last name."""
+    tokens = name.split()
+    if not tokens:
+        # An empty author part (e.g. a stray `and ,`) normalizes to a blank name
+        return [], ""
+    return tokens[:-1], tokens[-1]
+
+
+def _is_initial(token: str) -> bool:
+    return len(token.rstrip(".")) == 1
+
+
+class AuthorRegistry:
+    """
+    Cache normalized author names across an import run and map name variants (e.g. `Smith, J.` and `John Smith`) to a canonical form.
+
+    The registry can be saved to a JSON file and loaded again in a later run. Its `aliases` can be edited by hand to pin a variant to a
+    specific canonical name. Variants merged automatically are not saved, as they are re-checked against the names known in each run.
+    """
+
+    version = 1
+
+    def __init__(self, merge_variants: bool = False):
+        """
+        Initialise the registry.
+
+        Args:
+            merge_variants: whether to map abbreviated names (e.g. `J. Smith`) to a unique matching full name (e.g. `John Smith`)
+        """
+        self.merge_variants = merge_variants
+        # Raw BibTeX author string -> normalized name
+        self.names = {}
+        # Normalized name variant -> canonical name, as pinned by the user
+        self.aliases = {}
+        # Normalized name variant -> canonical name, as merged automatically in this run
+        self._merged = {}
+        # Lowercase last name -> normalized names with unabbreviated first names, used to resolve abbreviated variants
+        self._full_names = {}
+
+    @classmethod
+    def load(cls, path: Path, merge_variants: bool = False) -> "AuthorRegistry":
+        """
+        Load a registry previously saved with `save()`. A missing file results in an empty registry.
+
+        Args:
+            path: the JSON file to load
+            merge_variants: whether to map abbreviated names to a unique matching full name
+        """
+        from academic.utils import AcademicError
+
+        registry = cls(merge_variants=merge_variants)
+        path = Path(path)
+        if not path.exists():
+            return registry
+
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise AcademicError(f"Could not load author registry `{path}`: {e}")
+
+        version = data.get("version", cls.version)
+        if version != cls.version:
+            raise AcademicError(f"Unsupported author registry version `{version}` in `{path}`. Expected version {cls.version}.")
+
+        for raw, name in data.get("names", {}).items():
+            registry.names[raw] = name
+            registry._index(name)
+        registry.aliases.update(data.get("aliases", {}))
+        return registry
+
+    def save(self, path: Path):
+        """
+        Save the registry to a JSON file.
+
+        Args:
+            path: the JSON file to write
+        """
+        data = {"version": self.version, "names": dict(sorted(self.names.items())), "aliases": dict(sorted(self.aliases.items()))}
+        with Path(path).open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    def normalize(self, s: str) -> str:
+        """Return the normalized form of a raw author string, parsing it only the first time it is seen."""
+        name = self.names.get(s)
+        if name is None:
+            name = normalize_author_name(s)
+            self.names[s] = name
+            self._index(name)
+        return name
+
+    def add(self, author_str):
+        """
+        Register a list of raw author strings without resolving them.
+
+        Registering every entry's authors before resolving any of them makes the canonical names independent of entry order.
+        """
+        for s in author_str:
+            s = s.strip()
+            if len(s) > 0:
+                self.normalize(s)
+
+    def resolve(self, author_str):
+        """Convert a list of raw author strings to their canonical names."""
+        authors = []
+        for s in author_str:
+            s = s.strip()
+            if len(s) < 1:
+                continue
+            authors.append(self.canonical(self.normalize(s)))
+        return authors
+
+    def canonical(self, name: str) -> str:
+        """Return the canonical form of a normalized name."""
+        if name in self.aliases:
+            return self.aliases[name]
+        if not self.merge_variants:
+            return name
+        if name not in self._merged:
+            self._merged[name] = self._merge(name)
+        return self._merged[name]
+
+    def _merge(self, name: str) -> str:
+        """Find the unique full name matching an abbreviated name, if any."""
+        first_names, last_name = _split_name(name)
+        if not first_names or not any(_is_initial(i) for i in first_names):
+            return name
+
+        initials = [i[0].lower() for i in first_names]
+        candidates = [
+            full_name for full_name in self._full_names.get(last_name.lower(), ()) if [i[0].lower() for i in _split_name(full_name)[0]] == initials
+        ]
+        if len(candidates) == 1:
+            return candidates[0]
+        return name
+
+    def _index(self, name: str):
+        first_names, last_name = _split_name(name)
+        if last_name and first_names and not any(_is_initial(i) for i in first_names):
+            self._full_names.setdefault(last_name.lower(), set()).add(name)
+            # A new full name may make previous merges ambiguous.
+            self._merged.clear()
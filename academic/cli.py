@@ -6,7 +6,7 @@ import logging
 import sys
 from argparse import RawTextHelpFormatter
 
-from academic.import_bibtex import import_bibtex
+from academic.import_bibtex import BUNDLE_LAYOUTS, import_bibtex
 from academic.import_notebook import import_notebook
 
 # Initialise logger.
@@ -40,12 +40,39 @@ def parse_args(args):
     parser_a.add_argument("output", type=str, help="Output path (e.g. `content/publication/`)")
     parser_a.add_argument("--featured", action="store_true", help="Flag publications as featured")
     parser_a.add_argument("--overwrite", action="store_true", help="Overwrite existing files in output path")
+    parser_a.add_argument(
+        "--stable",
+        action="store_true",
+        help="When overwriting, keep the dates and manual edits of existing pages and only write files whose content changes",
+    )
+    parser_a.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted import, skipping completed items and regenerating partially written ones",
+    )
     parser_a.add_argument("--compact", action="store_true", help="Generate minimal markdown")
     parser_a.add_argument(
         "--normalize",
         action="store_true",
         help="Normalize each BibTeX keyword to lowercase with uppercase first letter",
     )
+    parser_a.add_argument(
+        "--layout",
+        choices=BUNDLE_LAYOUTS,
+        default="flat",
+        help="Layout of publication folders (BibTeX only): directly in the output path (`flat`), or in sub-folders by `year` or slug `hash` "
+        "prefix. Sharded layouts change Hugo URLs to include the sub-folder, unless `permalinks` sets `publication = '/:section/:slug/'`",
+    )
+    parser_a.add_argument(
+        "--author-registry",
+        type=str,
+        help="JSON file in which to persist normalized author names and aliases between imports",
+    )
+    parser_a.add_argument(
+        "--merge-authors",
+        action="store_true",
+        help="Map abbreviated author names (e.g. `Smith, J.`) to a unique matching full name (e.g. `John Smith`)",
+    )
     parser_a.add_argument("-v", "--verbose", action="store_true", required=False, help="Verbose mode")
     parser_a.add_argument(
         "-dr",
@@ -77,14 +104,23 @@ def parse_args(args):
                     normalize=known_args.normalize,
                     compact=known_args.compact,
                     dry_run=known_args.dry_run,
+                    author_registry=known_args.author_registry,
+                    merge_authors=known_args.merge_authors,
+                    resume=known_args.resume,
+                    stable=known_args.stable,
+                    layout=known_args.layout,
                 )
             elif known_args.input.lower().endswith(".ipynb"):
+                if known_args.layout != "flat":
+                    parser.error("`--layout` is only supported when importing BibTeX files")
                 # Run command to import bibtex.
                 import_notebook(
                     known_args.input,
                     output_dir=known_args.output,
                     overwrite=known_args.overwrite,
                     dry_run=known_args.dry_run,
+                    resume=known_args.resume,
+                    stable=known_args.stable,
                 )
 
 
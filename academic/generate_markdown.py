@@ -1,7 +1,10 @@
+from io import StringIO
 from pathlib import Path
 
 import ruamel.yaml
 
+from academic.utils import write_file
+
 
 class GenerateMarkdown:
     """
@@ -30,12 +33,13 @@ class GenerateMarkdown:
         # We use Ruamel's default round-trip loading to preserve key order and comments, rather than `YAML(typ='safe')`
         self.yaml_parser = ruamel.yaml.YAML()
 
-    def load(self, file: Path):
+    def load(self, file: Path, keep_content: bool = False):
         """
         Load the Markdown file to edit.
 
         Args:
             file: the Markdown filename to load. By default, it will be a copy of the Markdown template file saved to the output folder.
+            keep_content: whether to keep the Markdown content in Compact mode, e.g. when loading a previously generated file
 
         Returns: n/a - directly saves output to `self.yaml`
 
@@ -54,13 +58,14 @@ class GenerateMarkdown:
         # Detect both the YAML front matter and the Markdown content in the template
         delims_seen = 0
         for line in lines:
-            if line.startswith(self.delim):
+            # Only the first two delimiters enclose the front matter, later ones (e.g. horizontal rules) are part of the content
+            if delims_seen < 2 and line.startswith(self.delim):
                 delims_seen += 1
             else:
                 if delims_seen < 2:
                     front_matter_text.append(line)
                 # In Compact mode, we don't add any placeholder content to the page
-                elif not self.compact:
+                elif not self.compact or keep_content:
                     # Append any Markdown content from the template body (after the YAML front matter)
                     self.content.append(line)
 
@@ -88,15 +93,24 @@ class GenerateMarkdown:
         except AttributeError:
             pass
 
-    def dump(self):
+    def dump(self, skip_unchanged: bool = False):
         """
         Save the generated markdown to file.
+
+        Args:
+            skip_unchanged: whether to skip writing the file if its content on disk would not change
         """
         assert self.path, "You need to `.load()` first."
         if self.dry_run:
             return
 
-        with open(self.path, "w", encoding="utf-8") as f:
+        write_file(self.path, self.dumps(), skip_unchanged=skip_unchanged)
+
+    def dumps(self) -> str:
+        """
+        Generate the markdown as a string.
+        """
+        with StringIO() as f:
             f.write("{}\n".format(self.delim))
             if self.compact:
                 # For compact output, strip comments, new lines, and empty keys
@@ -120,3 +134,4 @@ class GenerateMarkdown:
             self.yaml_parser.dump(self.yaml, f)
             f.write("{}\n".format(self.delim))
             f.writelines(self.content)
+            return f.getvalue()
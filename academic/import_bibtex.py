@@ -1,17 +1,31 @@
 import calendar
+import copy
+import functools
+import hashlib
 import os
 import re
 from datetime import datetime
 from pathlib import Path
 
 import bibtexparser
-from bibtexparser.bibdatabase import BibDatabase
+import ruamel.yaml
 from bibtexparser.bparser import BibTexParser
-from bibtexparser.bwriter import BibTexWriter
 from bibtexparser.customization import convert_to_unicode
 
+from academic.authors import AuthorRegistry, normalize_author_name
 from academic.generate_markdown import GenerateMarkdown
+from academic.journal import ImportJournal
+from academic.publication import FRONT_MATTER_KEYS, Publication
 from academic.publication_type import PUB_TYPES_BIBTEX_TO_CSL
+from academic.utils import write_file
+
+# Layouts of publication bundles within the output folder:
+# `flat` saves bundles directly in the output folder, whereas `year` and `hash` shard them into sub-folders named by publication year or by
+# a 2-character hash prefix of the slug (up to 256 sub-folders), keeping the number of entries per folder bounded for large collections.
+BUNDLE_LAYOUTS = ("flat", "year", "hash")
+
+# Front matter keys which are set on import, from BibTeX or (for `slug`) for sharded bundle layouts
+IMPORTED_KEYS = FRONT_MATTER_KEYS + ("slug",)
 
 
 def import_bibtex(
@@ -22,6 +36,11 @@ def import_bibtex(
     normalize=False,
     compact=False,
     dry_run=False,
+    author_registry=None,
+    merge_authors=False,
+    resume=False,
+    stable=False,
+    layout="flat",
 ):
     """Import publications from BibTeX file"""
     from academic.cli import log
@@ -39,16 +58,55 @@ def import_bibtex(
         parser.customization = convert_to_unicode
         parser.ignore_nonstandard_types = False
         bib_database = bibtexparser.load(bibtex_file, parser=parser)
+
+    # Load the author registry, which caches normalized author names across entries (and runs, if persisted to file).
+    if author_registry:
+        registry = AuthorRegistry.load(author_registry, merge_variants=merge_authors)
+    else:
+        registry = AuthorRegistry(merge_variants=merge_authors)
+
+    # Register all authors up front so that name variants resolve to the same canonical name regardless of entry order.
+    if merge_authors:
         for entry in bib_database.entries:
-            parse_bibtex_entry(
-                entry,
-                pub_dir=pub_dir,
-                featured=featured,
-                overwrite=overwrite,
-                normalize=normalize,
-                compact=compact,
-                dry_run=dry_run,
+            registry.add(split_bibtex_authors(entry))
+
+    # Convert each entry to a compact `Publication` record once, releasing each entry as it is converted so that peak memory does not hold
+    # both all of the entries and all of the records.
+    entries = bib_database.entries
+    entries.reverse()
+    publications = []
+    while entries:
+        publications.append(parse_publication(entries.pop(), featured=featured, normalize=normalize, registry=registry))
+    del bib_database, entries
+
+    # Refuse to mix bundle layouts, as the existence check would not find the existing bundles and every publication would be duplicated.
+    existing_layout = find_existing_layout(publications, pub_dir, exclude=layout)
+    if existing_layout:
+        err = (
+            f"Publications in `{pub_dir}` use the `{existing_layout}` layout. Re-run with `--layout {existing_layout}`, "
+            f"or move the existing publications to the `{layout}` layout first."
+        )
+        log.error(err)
+        raise AcademicError(err)
+
+    # Journal the progress of the import so that it can be resumed with `--resume` if it is interrupted.
+    journal = ImportJournal(Path(pub_dir), resume=resume) if not dry_run else None
+
+    try:
+        for pub in publications:
+            write_publication_bundle(
+                pub, pub_dir=pub_dir, overwrite=overwrite, compact=compact, dry_run=dry_run, journal=journal, stable=stable, layout=layout
             )
+    finally:
+        if journal:
+            journal.close()
+
+    if journal:
+        journal.remove()
+
+    if author_registry and not dry_run:
+        log.info(f"Saving author registry to {author_registry}")
+        registry.save(author_registry)
 
 
 def parse_bibtex_entry(
@@ -59,54 +117,25 @@ def parse_bibtex_entry(
     normalize=False,
     compact=False,
     dry_run=False,
+    registry=None,
+    layout="flat",
 ):
     """Parse a bibtex entry and generate corresponding publication bundle"""
-    from academic.cli import log
-
-    log.info(f"Parsing entry {entry['ID']}")
-
-    bundle_path = os.path.join(pub_dir, slugify(entry["ID"]))
-    markdown_path = os.path.join(bundle_path, "index.md")
-    cite_path = os.path.join(bundle_path, "cite.bib")
-    date = datetime.utcnow()
-    timestamp = date.isoformat("T") + "Z"  # RFC 3339 timestamp.
+    pub = parse_publication(entry, featured=featured, normalize=normalize, registry=registry)
+    return write_publication_bundle(pub, pub_dir=pub_dir, overwrite=overwrite, compact=compact, dry_run=dry_run, layout=layout)
 
-    # Do not overwrite publication bundle if it already exists.
-    if not overwrite and os.path.isdir(bundle_path):
-        log.warning(f"Skipping creation of {bundle_path} as it already exists. " f"To overwrite, add the `--overwrite` argument.")
-        return
 
-    # Create bundle dir.
-    log.info(f"Creating folder {bundle_path}")
-    if not dry_run:
-        Path(bundle_path).mkdir(parents=True, exist_ok=True)
-
-    # Save citation file.
-    log.info(f"Saving citation to {cite_path}")
-    db = BibDatabase()
-    db.entries = [entry]
-    writer = BibTexWriter()
-    if not dry_run:
-        with open(cite_path, "w", encoding="utf-8") as f:
-            f.write(writer.write(db))
-
-    # Prepare YAML front matter for Markdown file.
-    if not dry_run:
-        from importlib import resources as import_resources
-
-        # Load the Markdown template from within the `templates` folder of the `academic` package
-        template = import_resources.read_text(__package__ + ".templates", "publication.md")
-
-        with open(markdown_path, "w") as f:
-            f.write(template)
+def parse_publication(entry, featured=False, normalize=False, registry=None):
+    """Parse a bibtex entry into a `Publication` record"""
+    from academic.cli import log
 
-    page = GenerateMarkdown(Path(bundle_path), dry_run=dry_run, compact=compact)
-    page.load(Path("index.md"))
+    log.info(f"Parsing entry {entry['ID']}")
 
-    page.yaml["title"] = clean_bibtex_str(entry["title"])
+    title = clean_bibtex_str(entry["title"])
 
+    subtitle = None
     if "subtitle" in entry:
-        page.yaml["subtitle"] = clean_bibtex_str(entry["subtitle"])
+        subtitle = clean_bibtex_str(entry["subtitle"])
 
     year, month, day = "", "01", "01"
     if "date" in entry:
@@ -124,30 +153,18 @@ def parse_bibtex_entry(
     if len(year) == 0:
         log.error(f'Invalid date for entry `{entry["ID"]}`.')
 
-    page.yaml["date"] = f"{year}-{month}-{day}"
-    page.yaml["publishDate"] = timestamp
-
-    authors = None
-    if "author" in entry:
-        authors = entry["author"]
-    elif "editor" in entry:
-        authors = entry["editor"]
-
+    authors = split_bibtex_authors(entry)
     if authors:
-        authors = clean_bibtex_authors([i.strip() for i in authors.replace("\n", " ").split(" and ")])
-        page.yaml["authors"] = authors
+        authors = clean_bibtex_authors(authors, registry)
 
     # Convert Bibtex publication type to the universal CSL standard, defaulting to `manuscript`
     default_csl_type = "manuscript"
     pub_type = PUB_TYPES_BIBTEX_TO_CSL.get(entry["ENTRYTYPE"], default_csl_type)
-    page.yaml["publication_types"] = [pub_type]
 
     if "abstract" in entry:
-        page.yaml["abstract"] = clean_bibtex_str(entry["abstract"])
+        abstract = clean_bibtex_str(entry["abstract"])
     else:
-        page.yaml["abstract"] = ""
-
-    page.yaml["featured"] = featured
+        abstract = ""
 
     # Publication name.
     # This field is Markdown formatted, wrapping the publication name in `*` for italics
@@ -159,39 +176,187 @@ def parse_bibtex_entry(
         publication = "*" + clean_bibtex_str(entry["publisher"]) + "*"
     else:
         publication = ""
-    page.yaml["publication"] = publication
 
+    tags = None
     if "keywords" in entry:
-        page.yaml["tags"] = clean_bibtex_tags(entry["keywords"], normalize)
+        tags = tuple(clean_bibtex_tags(entry["keywords"], normalize))
 
+    doi = None
     if "doi" in entry:
-        page.yaml["doi"] = clean_bibtex_str(entry["doi"])
+        doi = clean_bibtex_str(entry["doi"])
 
     links = []
+    url_pdf = None
     if all(f in entry for f in ["archiveprefix", "eprint"]) and entry["archiveprefix"].lower() == "arxiv":
-        links += [{"name": "arXiv", "url": "https://arxiv.org/abs/" + clean_bibtex_str(entry["eprint"])}]
+        links += [("arXiv", "https://arxiv.org/abs/" + clean_bibtex_str(entry["eprint"]))]
 
     if "url" in entry:
         sane_url = clean_bibtex_str(entry["url"])
 
         if sane_url[-4:].lower() == ".pdf":
-            page.yaml["url_pdf"] = sane_url
+            url_pdf = sane_url
         else:
-            links += [{"name": "URL", "url": sane_url}]
+            links += [("URL", sane_url)]
+
+    bibtex_fields, bibtex_values = Publication.pack_bibtex(entry)
+    return Publication(
+        id=entry["ID"],
+        slug=slugify(entry["ID"]),
+        title=title,
+        date=f"{year}-{month}-{day}",
+        publication_type=pub_type,
+        bibtex_fields=bibtex_fields,
+        bibtex_values=bibtex_values,
+        subtitle=subtitle,
+        authors=tuple(authors),
+        abstract=abstract,
+        featured=featured,
+        publication=publication,
+        tags=tags,
+        doi=doi,
+        url_pdf=url_pdf,
+        links=tuple(links),
+    )
+
+
+def write_publication_bundle(
+    pub,
+    pub_dir=os.path.join("content", "publication"),
+    overwrite=False,
+    compact=False,
+    dry_run=False,
+    journal=None,
+    stable=False,
+    layout="flat",
+):
+    """
+    Generate the publication bundle (`index.md` and `cite.bib`) for a `Publication` record
+
+    In stable mode, an existing `index.md` is updated in place rather than regenerated from the template, preserving its publish date,
+    Markdown content, and any front matter which is not set from BibTeX, and files are only written if their content changes.
+    """
+    from academic.cli import log
+
+    bundle_dir = get_bundle_dir(pub, layout)
+    bundle_path = os.path.join(pub_dir, bundle_dir)
+    markdown_path = os.path.join(bundle_path, "index.md")
+    cite_path = os.path.join(bundle_path, "cite.bib")
+    date = datetime.utcnow()
+    timestamp = date.isoformat("T") + "Z"  # RFC 3339 timestamp.
+
+    if journal:
+        # Skip bundles completed by the interrupted import, and regenerate any which it left partially written.
+        if journal.is_done(bundle_dir):
+            log.info(f"Skipping {bundle_path} as it was completed by the previous import")
+            return
+        if journal.needs_repair(bundle_dir):
+            log.warning(f"Regenerating {bundle_path} as it was partially written by the previous import")
+            overwrite = True
+            # A partially written `index.md` may just be a copy of the template, so it should not be preserved.
+            stable = False
+
+    # Do not overwrite publication bundle if it already exists.
+    if not overwrite and os.path.isdir(bundle_path):
+        log.warning(f"Skipping creation of {bundle_path} as it already exists. " f"To overwrite, add the `--overwrite` argument.")
+        return
+
+    if journal:
+        journal.start(bundle_dir)
+
+    # Create bundle dir.
+    log.info(f"Creating folder {bundle_path}")
+    if not dry_run:
+        Path(bundle_path).mkdir(parents=True, exist_ok=True)
+
+    # Save citation file.
+    log.info(f"Saving citation to {cite_path}")
+    if not dry_run:
+        write_file(Path(cite_path), pub.cite_bib(), skip_unchanged=stable)
 
-    if links:
-        page.yaml["links"] = links
+    # Update the previously generated Markdown file in stable mode, otherwise start from the template.
+    update_existing = stable and os.path.isfile(markdown_path)
+
+    # Prepare YAML front matter for Markdown file.
+    if not dry_run and not update_existing:
+        with open(markdown_path, "w", encoding="utf-8") as f:
+            f.write(load_template())
+
+    page = GenerateMarkdown(Path(bundle_path), dry_run=dry_run, compact=compact)
+    page.load(Path("index.md"), keep_content=update_existing)
+
+    front_matter = pub.front_matter()
+    if layout != "flat":
+        # Hugo builds URLs from the content path, so sharded bundles need a `slug` for the `/:section/:slug/` permalink to restore flat URLs.
+        front_matter["slug"] = pub.slug
+    if update_existing:
+        # Reset keys which are no longer set on import (e.g. a DOI removed from the entry, or a `slug` after switching to the flat layout) to
+        # their template defaults.
+        template_front_matter = load_template_front_matter()
+        for key in IMPORTED_KEYS:
+            if key not in front_matter and key in page.yaml:
+                if key in template_front_matter:
+                    front_matter[key] = copy.deepcopy(template_front_matter[key])
+                else:
+                    del page.yaml[key]
+
+    for key, value in front_matter.items():
+        # Only assign changed values, as replacing a value also drops any comments which are attached to it.
+        if page.yaml.get(key) != value:
+            page.yaml[key] = value
+    if not (update_existing and page.yaml.get("publishDate")):
+        page.yaml["publishDate"] = timestamp
 
     # Save Markdown file.
     try:
         log.info(f"Saving Markdown to '{markdown_path}'")
         if not dry_run:
-            page.dump()
+            page.dump(skip_unchanged=stable)
+            if journal:
+                journal.finish(bundle_dir)
     except IOError:
         log.error("Could not save file.")
     return page
 
 
+@functools.cache
+def load_template():
+    """Load the Markdown template from within the `templates` folder of the `academic` package"""
+    from importlib import resources as import_resources
+
+    return import_resources.read_text(__package__ + ".templates", "publication.md")
+
+
+@functools.cache
+def load_template_front_matter():
+    """Load the front matter of the Markdown template, which provides the default value of each key"""
+    front_matter_text = load_template().split("---\n", 2)[1]
+    return ruamel.yaml.YAML(typ="safe").load(front_matter_text)
+
+
+def find_existing_layout(publications, pub_dir, exclude=None):
+    """Find the bundle layout of any of the publications which already exist in the output folder, other than the `exclude` layout"""
+    for pub in publications:
+        for layout in BUNDLE_LAYOUTS:
+            if layout != exclude and os.path.isfile(os.path.join(pub_dir, get_bundle_dir(pub, layout), "index.md")):
+                return layout
+    return None
+
+
+def get_bundle_dir(pub, layout="flat"):
+    """Get the path of a publication's bundle, relative to the output folder, for the given bundle layout"""
+    from academic.utils import AcademicError
+
+    if layout == "flat":
+        return pub.slug
+    elif layout == "year":
+        year = pub.date.split("-")[0]
+        return os.path.join(slugify(year) or "undated", pub.slug)
+    elif layout == "hash":
+        prefix = hashlib.md5(pub.slug.encode("utf-8"), usedforsecurity=False).hexdigest()[:2]
+        return os.path.join(prefix, pub.slug)
+    raise AcademicError(f"Unknown bundle layout `{layout}`. Choose from: {', '.join(BUNDLE_LAYOUTS)}")
+
+
 def slugify(s, lower=True):
     bad_symbols = (".", "_", ":")  # Symbols to replace with hyphen delimiter.
     delimiter = "-"
@@ -210,31 +375,25 @@ def slugify(s, lower=True):
     return s
 
 
-def clean_bibtex_authors(author_str):
-    """Convert author names to `firstname(s) lastname` format."""
+def split_bibtex_authors(entry):
+    """Split the author (or, failing that, editor) field of a BibTeX entry into a list of raw author names."""
+    authors = entry["author"] if "author" in entry else entry.get("editor")
+    if not authors:
+        return []
+    return [i.strip() for i in authors.replace("\n", " ").split(" and ")]
+
+
+def clean_bibtex_authors(author_str, registry=None):
+    """Convert author names to `firstname(s) lastname` format, using the author registry if one is given."""
+    if registry is not None:
+        return registry.resolve(author_str)
+
     authors = []
     for s in author_str:
         s = s.strip()
         if len(s) < 1:
             continue
-
-        if "," in s:
-            split_names = s.split(",", 1)
-            last_name = split_names[0].strip()
-            first_names = [i.strip() for i in split_names[1].split()]
-        else:
-            split_names = s.split()
-            last_name = split_names.pop()
-            first_names = [i.replace(".", ". ").strip() for i in split_names]
-
-        if last_name in ["jnr", "jr", "junior"]:
-            last_name = first_names.pop()
-
-        for item in first_names:
-            if item in ["ben", "van", "der", "de", "la", "le"]:
-                last_name = first_names.pop() + " " + last_name
-
-        authors.append(" ".join(first_names) + " " + last_name)
+        authors.append(normalize_author_name(s))
 
     return authors
 
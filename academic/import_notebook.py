@@ -10,7 +10,9 @@ import nbformat as nbf
 import yaml
 from traitlets.config import Config
 
+from academic.journal import ImportJournal
 from academic.jupyter_whitespace_remover import JupyterWhitespaceRemover
+from academic.utils import write_file
 
 
 def _get_slug(text: str) -> str:
@@ -22,29 +24,42 @@ def import_notebook(
     output_dir=os.path.join("content", "post"),
     overwrite=False,
     dry_run=False,
+    resume=False,
+    stable=False,
 ):
     """Import blog posts from Jupyter Notebook files"""
     from academic.cli import log
 
+    # Journal the progress of the import so that it can be resumed with `--resume` if it is interrupted.
+    journal = ImportJournal(Path(output_dir), resume=resume) if not dry_run else None
+
     log.info(f"Searching for Jupyter notebooks in `{input_path}`")
-    for filename in glob.glob(input_path, recursive=True):
-        if not (filename.endswith(".ipynb") and os.path.basename(filename) != ".ipynb_checkpoints"):
-            continue
+    try:
+        # Import notebooks in a consistent order, so that a resumed import proceeds in the same order as the interrupted one.
+        for filename in sorted(glob.glob(input_path, recursive=True)):
+            if not (filename.endswith(".ipynb") and os.path.basename(filename) != ".ipynb_checkpoints"):
+                continue
+
+            log.debug(f"Found notebook `{filename}`")
 
-        log.debug(f"Found notebook `{filename}`")
+            # Read Notebook
+            nb = nbf.read(open(filename, "r"), as_version=4)
 
-        # Read Notebook
-        nb = nbf.read(open(filename, "r"), as_version=4)
+            # Export Markdown
+            nbc_config = Config()
+            nbc_config.MarkdownExporter.preprocessors = [JupyterWhitespaceRemover]
+            exporter = nbc.MarkdownExporter(config=nbc_config)
+            if not dry_run:
+                _export(nb, exporter, output_dir, filename, ".md", overwrite, journal, stable)
+    finally:
+        if journal:
+            journal.close()
 
-        # Export Markdown
-        nbc_config = Config()
-        nbc_config.MarkdownExporter.preprocessors = [JupyterWhitespaceRemover]
-        exporter = nbc.MarkdownExporter(config=nbc_config)
-        if not dry_run:
-            _export(nb, exporter, output_dir, filename, ".md", overwrite)
+    if journal:
+        journal.remove()
 
 
-def _export(nb, exporter, output_dir, filename, extension, overwrite):
+def _export(nb, exporter, output_dir, filename, extension, overwrite, journal=None, stable=False):
     from academic.cli import log
 
     # Determine output path for page bundle
@@ -52,11 +67,24 @@ def _export(nb, exporter, output_dir, filename, extension, overwrite):
     slug = _get_slug(filename_base)
     page_bundle_path = Path(output_dir) / slug
 
+    if journal:
+        # Skip blog posts completed by the interrupted import, and regenerate any which it left partially written.
+        if journal.is_done(slug):
+            log.info(f"Skipping `{page_bundle_path}` as it was completed by the previous import")
+            return
+        if journal.needs_repair(slug):
+            log.warning(f"Regenerating `{page_bundle_path}` as it was partially written by the previous import")
+            overwrite = True
+            stable = False
+
     # Do not overwrite blog post if it already exists
     if not overwrite and os.path.isdir(page_bundle_path):
         log.debug(f"Skipping creation of `{page_bundle_path}` as it already exists. To overwrite, add the `--overwrite` argument.")
         return
 
+    if journal:
+        journal.start(slug)
+
     log.info(f"Importing notebook `{filename}`")
 
     # Create page bundle folder
@@ -76,8 +104,7 @@ def _export(nb, exporter, output_dir, filename, extension, overwrite):
     # Export notebook resources
     for name, data in resources.get("outputs", {}).items():
         output_filename = Path(page_bundle_path) / name
-        with open(output_filename, "wb") as image_file:
-            image_file.write(data)
+        write_file(output_filename, data, skip_unchanged=stable)
 
     # Try to find title as top-level heading (h1), falling back to filename
     search = re.search("^#{1}(.*)", body)
@@ -94,6 +121,13 @@ def _export(nb, exporter, output_dir, filename, extension, overwrite):
     date = datetime.now().strftime("%Y-%m-%d")
     front_matter = {"title": title, "date": date}
     front_matter.update(front_matter_from_file)
+    output_filename = os.path.join(page_bundle_path, "index" + extension)
+    if stable:
+        # Keep the date of the previously generated page, so that re-importing an unchanged notebook produces identical output.
+        # Other front matter is owned by the notebook's metadata, so keys removed from it are not carried over.
+        previous_front_matter = _load_front_matter(output_filename)
+        if "date" in previous_front_matter and "date" not in front_matter_from_file:
+            front_matter["date"] = previous_front_matter["date"]
     log.info(f"Generating page with title: {front_matter['title']}")
 
     # Unlike the Bibtex converter, we can't easily use Ruamel YAML library here as we need to output to string
@@ -104,9 +138,28 @@ def _export(nb, exporter, output_dir, filename, extension, overwrite):
     output = "\n".join(("---", front_matter_yaml, "---", clean_markdown(body)))
 
     # Write output file
-    output_filename = os.path.join(page_bundle_path, "index" + extension)
-    with open(output_filename, "w") as text_file:
-        text_file.write(output)
+    write_file(Path(output_filename), output, skip_unchanged=stable)
+
+    if journal:
+        journal.finish(slug)
+
+
+def _load_front_matter(path) -> dict:
+    """
+    Load the YAML front matter of a previously generated page, if it exists.
+    """
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    parts = text.split("---\n", 2)
+    if len(parts) < 3 or parts[0] != "":
+        return {}
+    try:
+        front_matter = yaml.safe_load(parts[1])
+    except yaml.YAMLError:
+        return {}
+    return front_matter if isinstance(front_matter, dict) else {}
 
 
 def clean_markdown(body: str) -> str:
@@ -0,0 +1,85 @@
+import json
+import os
+from pathlib import Path
+
+JOURNAL_FILENAME = ".academic-import.jsonl"
+
+
+class ImportJournal:
+    """
+    Record the progress of an import in the output folder, so that an interrupted import can be resumed.
+
+    Every import records each page bundle as `started` before anything is written to it and as `done` once it is complete. When resuming,
+    `done` bundles are skipped and bundles which were `started` but not `done` are regenerated. The journal is deleted once the import
+    completes.
+    """
+
+    def __init__(self, output_dir: Path, resume: bool = False):
+        """
+        Initialise the journal.
+
+        Args:
+            output_dir: the output folder of the import, in which the journal is saved
+            resume: whether to load the progress of a previous interrupted import into the same folder, otherwise it is discarded
+        """
+        self.path = Path(output_dir) / JOURNAL_FILENAME
+        self.started = set()
+        self.done = set()
+        self._file = None
+        if self.path.exists():
+            if resume:
+                self._load()
+            else:
+                os.remove(self.path)
+
+    def _load(self):
+        from academic.cli import log
+
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # The last line may be truncated if the previous import was killed whilst writing it.
+                    continue
+                if record.get("status") == "done":
+                    self.done.add(record["key"])
+                else:
+                    self.started.add(record["key"])
+        log.info(f"Resuming import from `{self.path}` with {len(self.done)} completed item(s)")
+
+    def is_done(self, key: str) -> bool:
+        """Whether the bundle was completed by the interrupted import which is being resumed."""
+        return key in self.done
+
+    def needs_repair(self, key: str) -> bool:
+        """Whether the bundle was partially written by the interrupted import which is being resumed."""
+        return key in self.started and key not in self.done
+
+    def start(self, key: str):
+        """Record that the bundle is about to be written."""
+        self._write(key, "started")
+
+    def finish(self, key: str):
+        """Record that the bundle has been completely written."""
+        self._write(key, "done")
+
+    def close(self):
+        """Close the journal file, keeping the journal so that an interrupted import can be resumed."""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Delete the journal once the import has completed."""
+        self.close()
+        if self.path.exists():
+            os.remove(self.path)
+
+    def _write(self, key: str, status: str):
+        if not self._file:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        self._file.write(json.dumps({"key": key, "status": status}) + "\n")
+        # Flush each record so that it survives the process being killed.
+        self._file.flush()
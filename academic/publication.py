@@ -0,0 +1,89 @@
+import sys
+from dataclasses import dataclass
+
+from bibtexparser.bibdatabase import BibDatabase
+from bibtexparser.bwriter import BibTexWriter
+
+# Tuples of BibTeX field names, shared between all publications which have the same fields
+_FIELD_NAMES = {}
+
+# Front matter keys which are set from BibTeX by `Publication.front_matter()`
+FRONT_MATTER_KEYS = (
+    "title",
+    "subtitle",
+    "date",
+    "authors",
+    "publication_types",
+    "abstract",
+    "featured",
+    "publication",
+    "tags",
+    "doi",
+    "url_pdf",
+    "links",
+)
+
+
+@dataclass(slots=True)
+class Publication:
+    """
+    A compact, typed record of a single BibTeX publication, from which both the Markdown front matter and the `cite.bib` file are rendered.
+
+    The record keeps the raw BibTeX values for `cite.bib` alongside the cleaned front matter values, so it is only modestly smaller than the
+    parsed entry dict (see `benchmarks/memory_per_entry.py`). Its main benefit is replacing the entry dict, `BibDatabase`, and Ruamel map per
+    publication with a single typed object. Lists are stored as tuples and the BibTeX field names are shared between records.
+    """
+
+    id: str
+    slug: str
+    title: str
+    date: str
+    publication_type: str
+    bibtex_fields: tuple
+    bibtex_values: tuple
+    subtitle: str | None = None
+    authors: tuple = ()
+    abstract: str = ""
+    featured: bool = False
+    publication: str = ""
+    tags: tuple | None = None
+    doi: str | None = None
+    url_pdf: str | None = None
+    links: tuple = ()
+
+    @staticmethod
+    def pack_bibtex(entry: dict):
+        """Pack a BibTeX entry dict into a shared tuple of field names and a tuple of the corresponding values."""
+        fields = tuple(sys.intern(k) for k in entry)
+        fields = _FIELD_NAMES.setdefault(fields, fields)
+        return fields, tuple(entry.values())
+
+    def front_matter(self) -> dict:
+        """
+        Render the YAML front matter keys set from BibTeX, in the order they should be applied to the Markdown template.
+        """
+        fm = {"title": self.title}
+        if self.subtitle is not None:
+            fm["subtitle"] = self.subtitle
+        fm["date"] = self.date
+        if self.authors:
+            fm["authors"] = list(self.authors)
+        fm["publication_types"] = [self.publication_type]
+        fm["abstract"] = self.abstract
+        fm["featured"] = self.featured
+        fm["publication"] = self.publication
+        if self.tags is not None:
+            fm["tags"] = list(self.tags)
+        if self.doi is not None:
+            fm["doi"] = self.doi
+        if self.url_pdf is not None:
+            fm["url_pdf"] = self.url_pdf
+        if self.links:
+            fm["links"] = [{"name": name, "url": url} for name, url in self.links]
+        return fm
+
+    def cite_bib(self) -> str:
+        """Render the publication as a standalone BibTeX citation."""
+        db = BibDatabase()
+        db.entries = [dict(zip(self.bibtex_fields, self.bibtex_values))]
+        return BibTexWriter().write(db)
@@ -1,2 +1,37 @@
+from pathlib import Path
+
+
 class AcademicError(Exception):
     pass
+
+
+def write_file(path: Path, content: str | bytes, skip_unchanged: bool = False) -> bool:
+    """
+    Write text or binary content to a file.
+
+    Args:
+        path: the file to write
+        content: the text (written in text mode as UTF-8) or bytes to write
+        skip_unchanged: whether to leave the file untouched if it already has exactly this content
+
+    Returns: whether the file was written
+    """
+    from academic.cli import log
+
+    path = Path(path)
+    if skip_unchanged and path.is_file():
+        try:
+            unchanged = (path.read_text(encoding="utf-8") if isinstance(content, str) else path.read_bytes()) == content
+        except UnicodeDecodeError:
+            unchanged = False
+        if unchanged:
+            log.info(f"Skipping `{path}` as it is unchanged")
+            return False
+
+    if isinstance(content, str):
+        with path.open("w", encoding="utf-8") as f:
+            f.write(content)
+    else:
+        with path.open("wb") as f:
+            f.write(content)
+    return True
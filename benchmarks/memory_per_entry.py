@@ -0,0 +1,118 @@
+"""
+Measure the memory held per publication when keeping a large BibTeX import in memory.
+
+Compares the BibTeX entry dicts produced by `bibtexparser` with the `Publication` records built from them, and reports the peak memory
+of a whole (dry run) `import_bibtex` compared with only parsing the same BibTeX file.
+
+Usage:
+
+    poetry run python benchmarks/memory_per_entry.py [number_of_entries]
+"""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import bibtexparser
+from bibtexparser.bparser import BibTexParser
+from bibtexparser.customization import convert_to_unicode
+
+from academic.authors import AuthorRegistry
+from academic.import_bibtex import parse_publication
+
+ENTRY_TEMPLATE = """
+@article{{smith{i},
+  title = {{A study of {{Things}} number {i}}},
+  author = {{Smith, John and Doe, Jane and Author {j}, Some}},
+  journal = {{Journal of Reproducible Benchmarks}},
+  year = {{{year}}},
+  month = {{jan}},
+  volume = {{{i}}},
+  pages = {{1--10}},
+  doi = {{10.1000/bench.{i}}},
+  keywords = {{memory, benchmark, publication {j}}},
+  url = {{https://example.org/papers/{i}.pdf}},
+  abstract = {{An abstract for entry {i} which is long enough to be representative of a typical publication abstract.}}
+}}
+"""
+
+
+# Run in a separate process, so that its peak memory is not affected by the rest of the benchmark.
+# Note: `ru_maxrss` is reported in KiB on Linux.
+PEAK_MEMORY_SCRIPT = """
+import resource, sys
+import bibtexparser
+from bibtexparser.bparser import BibTexParser
+from bibtexparser.customization import convert_to_unicode
+import academic.cli
+from academic.import_bibtex import import_bibtex
+if sys.argv[1] == "import":
+    import_bibtex(sys.argv[2], pub_dir=sys.argv[3], dry_run=True)
+else:
+    parser = BibTexParser(common_strings=True)
+    parser.customization = convert_to_unicode
+    parser.ignore_nonstandard_types = False
+    with open(sys.argv[2], encoding="utf-8") as f:
+        bib_database = bibtexparser.load(f, parser=parser)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+"""
+
+
+def _generate_bibtex(count):
+    return "".join(ENTRY_TEMPLATE.format(i=i, j=i % 300, year=1990 + i % 35) for i in range(count))
+
+
+def _load_entries(count):
+    bibtex = _generate_bibtex(count)
+    parser = BibTexParser(common_strings=True)
+    parser.customization = convert_to_unicode
+    parser.ignore_nonstandard_types = False
+    return bibtexparser.loads(bibtex, parser=parser).entries
+
+
+def _deep_size(obj, seen):
+    """Total size of an object and everything it references, counting objects shared across the collection only once."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_deep_size(i, seen) for i in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(_deep_size(getattr(obj, name), seen) for name in obj.__slots__)
+    return size
+
+
+def _peak_memory(mode, count):
+    """Peak resident memory, in bytes, of a process which either imports (`import`) or only parses (`parse`) a BibTeX file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        bibtex_path = Path(tmp) / "publications.bib"
+        bibtex_path.write_text(_generate_bibtex(count), encoding="utf-8")
+        args = [sys.executable, "-c", PEAK_MEMORY_SCRIPT, mode, str(bibtex_path), str(Path(tmp) / "publication")]
+        return int(subprocess.run(args, check=True, capture_output=True, text=True).stdout)
+
+
+def main(count=2000):
+    entries = _load_entries(count)
+    registry = AuthorRegistry()
+    publications = [parse_publication(entry, registry=registry) for entry in entries]
+    entries_size = _deep_size(entries, set())
+    # Measured separately, as the records are retained on their own once the entry dicts are released.
+    publications_size = _deep_size(publications, set())
+
+    print(f"Entries: {count}")
+    print(f"bibtexparser entry dicts: {entries_size / count:,.0f} bytes per entry")
+    print(f"Publication records:      {publications_size / count:,.0f} bytes per entry")
+
+    # The marginal peak per entry, between importing `count` and `count // 2` entries, excludes the fixed cost of the interpreter and modules.
+    half = count // 2
+    for mode, label in (("parse", "Peak memory of parsing:  "), ("import", "Peak memory of importing:")):
+        peak, half_peak = _peak_memory(mode, count), _peak_memory(mode, half)
+        print(f"{label} {peak / 2**20:,.1f} MiB ({(peak - half_peak) / (count - half):,.0f} bytes per entry)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -2,10 +2,14 @@ import typing
 from pathlib import Path
 
 import bibtexparser
+import pytest
 from bibtexparser.bparser import BibTexParser
 
 from academic import cli, import_bibtex
+from academic.authors import AuthorRegistry
 from academic.generate_markdown import GenerateMarkdown
+from academic.journal import JOURNAL_FILENAME
+from academic.utils import AcademicError
 
 bibtex_dir = Path(__file__).parent / "data"
 
@@ -21,16 +25,22 @@ def _process_bibtex(file, expected_count=1) -> "typing.List[GenerateMarkdown]":
     :param expected_count: The expected number of entries inside the .bib
     :return: The parsed metadata as a list of EditableFM
     """
+    results = []
+    for entry in _load_entries(file):
+        results.append(import_bibtex.parse_bibtex_entry(entry, dry_run=True))
+    assert len(results) == expected_count
+    return results
+
+
+def _load_entries(file) -> "typing.List[dict]":
+    """
+    Load the entries of a BibTeX .bib file from the test data folder
+    """
     parser = BibTexParser(common_strings=True)
     parser.customization = import_bibtex.convert_to_unicode
     parser.ignore_nonstandard_types = False
     with Path(bibtex_dir, file).open("r", encoding="utf-8") as bibtex_file:
-        bib_database = bibtexparser.load(bibtex_file, parser=parser)
-        results = []
-        for entry in bib_database.entries:
-            results.append(import_bibtex.parse_bibtex_entry(entry, dry_run=True))
-        assert len(results) == expected_count
-        return results
+        return bibtexparser.load(bibtex_file, parser=parser).entries
 
 
 def _test_publication_type(metadata: GenerateMarkdown, expected_type: str):
@@ -52,3 +62,165 @@ def test_bibtex_types():
         _test_publication_type(metadata, "thesis")
     for metadata in _process_bibtex("book.bib", expected_count=2):
         _test_publication_type(metadata, "book")
+
+
+def test_clean_bibtex_authors():
+    assert import_bibtex.clean_bibtex_authors(["Smith, John", "J. Doe", " ", "Ludwig van Beethoven"]) == [
+        "John Smith",
+        "J. Doe",
+        "Ludwig van Beethoven",
+    ]
+
+
+def test_author_registry_blank_author():
+    # A blank author part is kept as a blank name, as without a registry, rather than crashing the import.
+    for merge_variants in (False, True):
+        registry = AuthorRegistry(merge_variants=merge_variants)
+        registry.add(["Smith, John", ",", "Doe, J."])
+        assert registry.resolve(["Smith, John", ",", "Doe, J."]) == import_bibtex.clean_bibtex_authors(["Smith, John", ",", "Doe, J."])
+        assert registry.resolve([","]) == [" "]
+
+
+def test_author_registry_merges_variants(tmp_path):
+    registry = AuthorRegistry(merge_variants=True)
+    registry.add(["Smith, J.", "John Smith", "Doe, J.", "Jane Doe", "John Doe"])
+    # `J. Smith` has a single matching full name, whereas `J. Doe` is ambiguous so is left as is.
+    assert registry.resolve(["Smith, J.", "Doe, J."]) == ["John Smith", "J. Doe"]
+
+    registry_path = tmp_path / "authors.json"
+    registry.save(registry_path)
+    loaded = AuthorRegistry.load(registry_path)
+    assert loaded.names == registry.names
+    # Automatic merges are not persisted, so they only apply when variant merging is enabled.
+    assert loaded.resolve(["Smith, J."]) == ["J. Smith"]
+
+    # Automatic merges are re-checked against the names known in a later run.
+    loaded.merge_variants = True
+    loaded.add(["Jane Smith"])
+    assert loaded.resolve(["Smith, J."]) == ["J. Smith"]
+
+
+def test_author_registry_aliases(tmp_path):
+    registry_path = tmp_path / "authors.json"
+    registry_path.write_text('{"version": 1, "names": {}, "aliases": {"J. Smith": "Jane Smith"}}')
+    registry = AuthorRegistry.load(registry_path)
+    # Aliases pinned by the user always apply.
+    assert registry.resolve(["Smith, J."]) == ["Jane Smith"]
+    registry.save(registry_path)
+    assert AuthorRegistry.load(registry_path).aliases == {"J. Smith": "Jane Smith"}
+
+
+def test_publication_record():
+    pub = import_bibtex.parse_publication(_load_entries("article.bib")[0])
+    assert pub.front_matter()["publication_types"] == ["article-journal"]
+    # The citation is rendered from the fields held by the record.
+    assert pub.cite_bib().lstrip().startswith("@article{")
+    assert f"{pub.id}," in pub.cite_bib()
+
+
+def test_bibtex_import_resume(tmp_path, monkeypatch):
+    bibtex = str(bibtex_dir / "report.bib")
+    dump = GenerateMarkdown.dump
+
+    def interrupted_dump(self, *args, **kwargs):
+        # Simulate an import which is killed after completing `TR-1234` and whilst writing `TR-2345`.
+        if self.path.parent.name == "tr-2345":
+            raise KeyboardInterrupt
+        dump(self, *args, **kwargs)
+
+    monkeypatch.setattr(GenerateMarkdown, "dump", interrupted_dump)
+    with pytest.raises(KeyboardInterrupt):
+        import_bibtex.import_bibtex(bibtex, pub_dir=str(tmp_path))
+    monkeypatch.undo()
+
+    completed_path = tmp_path / "tr-1234" / "index.md"
+    completed_path.write_text("completed")
+    # The interrupted import leaves the template in place of the partially written page.
+    assert "Publication title" in (tmp_path / "tr-2345" / "index.md").read_text()
+    assert (tmp_path / JOURNAL_FILENAME).exists()
+
+    import_bibtex.import_bibtex(bibtex, pub_dir=str(tmp_path), resume=True)
+
+    assert completed_path.read_text() == "completed"
+    assert "Publication title" not in (tmp_path / "tr-2345" / "index.md").read_text()
+    assert not (tmp_path / JOURNAL_FILENAME).exists()
+
+
+def test_bibtex_import_stable(tmp_path):
+    bibtex = str(bibtex_dir / "article.bib")
+    import_bibtex.import_bibtex(bibtex, pub_dir=str(tmp_path))
+    markdown_path = next(tmp_path.glob("*/index.md"))
+    edited = markdown_path.read_text().replace("summary: ''", "summary: My summary")
+    markdown_path.write_text(edited)
+
+    import_bibtex.import_bibtex(bibtex, pub_dir=str(tmp_path), overwrite=True, stable=True)
+
+    # The publish date and manual edits are preserved, so an unchanged publication is not rewritten.
+    assert markdown_path.read_text() == edited
+
+
+def test_bibtex_import_stable_resets_removed_fields(tmp_path):
+    bibtex_path = tmp_path / "article.bib"
+    article = (bibtex_dir / "article.bib").read_text()
+    bibtex_path.write_text(article.replace("volume  = 4", "volume  = 4,\n  doi = {10.1000/182},\n  url = {https://example.org/paper.pdf}"))
+    import_bibtex.import_bibtex(str(bibtex_path), pub_dir=str(tmp_path / "publication"))
+    markdown_path = tmp_path / "publication" / "article-id" / "index.md"
+    assert "doi: 10.1000/182" in markdown_path.read_text()
+
+    # Fields removed from the BibTeX entry are reset to their template defaults.
+    bibtex_path.write_text(article)
+    import_bibtex.import_bibtex(str(bibtex_path), pub_dir=str(tmp_path / "publication"), overwrite=True, stable=True)
+    assert "doi: ''" in markdown_path.read_text()
+    assert "url_pdf: ''" in markdown_path.read_text()
+
+
+def test_bibtex_import_stable_keeps_horizontal_rules(tmp_path):
+    bibtex = str(bibtex_dir / "article.bib")
+    import_bibtex.import_bibtex(bibtex, pub_dir=str(tmp_path), compact=True)
+    markdown_path = next(tmp_path.glob("*/index.md"))
+    edited = markdown_path.read_text() + "First paragraph.\n\n---\n\nSecond paragraph.\n"
+    markdown_path.write_text(edited)
+
+    import_bibtex.import_bibtex(bibtex, pub_dir=str(tmp_path), overwrite=True, stable=True, compact=True)
+
+    assert markdown_path.read_text() == edited
+
+
+def test_bibtex_import_layouts(tmp_path):
+    bibtex = str(bibtex_dir / "thesis.bib")
+    import_bibtex.import_bibtex(bibtex, pub_dir=str(tmp_path / "year"), layout="year")
+    import_bibtex.import_bibtex(bibtex, pub_dir=str(tmp_path / "hash"), layout="hash")
+
+    for pub in map(import_bibtex.parse_publication, _load_entries("thesis.bib")):
+        assert (tmp_path / "year" / pub.date[:4] / pub.slug / "index.md").is_file()
+        assert (tmp_path / "hash" / import_bibtex.get_bundle_dir(pub, "hash") / "index.md").is_file()
+        assert len(Path(import_bibtex.get_bundle_dir(pub, "hash")).parts[0]) == 2
+        # A slug is set so that Hugo permalinks can keep flat URLs for sharded bundles.
+        assert f"slug: {pub.slug}" in (tmp_path / "year" / pub.date[:4] / pub.slug / "index.md").read_text()
+
+
+def test_author_registry_version(tmp_path):
+    registry_path = tmp_path / "authors.json"
+    registry_path.write_text('{"version": 99, "names": {}, "aliases": {}}')
+    with pytest.raises(AcademicError):
+        AuthorRegistry.load(registry_path)
+
+
+def test_bibtex_import_rejects_mixed_layouts(tmp_path):
+    bibtex = str(bibtex_dir / "thesis.bib")
+    import_bibtex.import_bibtex(bibtex, pub_dir=str(tmp_path), layout="year")
+    with pytest.raises(AcademicError):
+        import_bibtex.import_bibtex(bibtex, pub_dir=str(tmp_path), overwrite=True)
+    assert not any((tmp_path / pub.slug).exists() for pub in map(import_bibtex.parse_publication, _load_entries("thesis.bib")))
+
+
+def test_bibtex_import_stable_resets_slug(tmp_path):
+    bibtex = str(bibtex_dir / "article.bib")
+    import_bibtex.import_bibtex(bibtex, pub_dir=str(tmp_path), layout="hash")
+    bundle_path = next(tmp_path.glob("*/article-id"))
+    assert "slug: article-id" in (bundle_path / "index.md").read_text()
+
+    # After moving the bundle to the flat layout, a stable re-import removes the `slug` which is only needed for sharded layouts.
+    bundle_path.rename(tmp_path / "article-id")
+    import_bibtex.import_bibtex(bibtex, pub_dir=str(tmp_path), overwrite=True, stable=True)
+    assert "slug:" not in (tmp_path / "article-id" / "index.md").read_text()
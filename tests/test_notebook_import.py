@@ -1,6 +1,14 @@
 import logging
+import re
+from pathlib import Path
+
+import nbformat as nbf
+import pytest
 
 from academic import cli
+from academic import import_notebook as import_notebook_module
+from academic.import_notebook import import_notebook
+from academic.journal import JOURNAL_FILENAME
 
 
 def test_notebook_import_no_output(capfd):
@@ -45,3 +53,58 @@ def test_notebook_import_debug_level(caplog):
     # Note: this logging output should only be shown at DEBUG log level, so we set the corresponding level above
     assert "Found notebook `tests/data/notebooks/test.ipynb`" in caplog.text
     assert "Found notebook `tests/data/notebooks/blog-with-jupyter.ipynb`" in caplog.text
+
+
+def test_notebook_import_stable(tmp_path):
+    notebook_path = tmp_path / "my-post.ipynb"
+    nb = nbf.read(Path("tests/data/notebooks/blog-with-jupyter.ipynb"), as_version=4)
+    nb["metadata"]["front_matter"]["tags"] = ["python"]
+    nbf.write(nb, notebook_path)
+    output_dir = tmp_path / "post"
+    import_notebook(str(notebook_path), output_dir=str(output_dir))
+    markdown_path = output_dir / "my-post" / "index.md"
+    edited = re.sub("^date: .*$", "date: '2020-01-01'", markdown_path.read_text(), flags=re.MULTILINE)
+    markdown_path.write_text(edited)
+
+    # The date is preserved, so an unchanged notebook is not rewritten.
+    import_notebook(str(notebook_path), output_dir=str(output_dir), overwrite=True, stable=True)
+    assert markdown_path.read_text() == edited
+
+    # Front matter removed from the notebook is not carried over from the previous page.
+    del nb["metadata"]["front_matter"]["tags"]
+    nbf.write(nb, notebook_path)
+    import_notebook(str(notebook_path), output_dir=str(output_dir), overwrite=True, stable=True)
+    assert "date: '2020-01-01'" in markdown_path.read_text()
+    assert "tags:" not in markdown_path.read_text()
+
+
+def test_notebook_import_rejects_layout():
+    with pytest.raises(SystemExit):
+        cli.parse_args(["import", "tests/data/notebooks/*.ipynb", "content/post/", "--dry-run", "--layout", "year"])
+
+
+def test_notebook_import_resume(tmp_path, monkeypatch):
+    write_file = import_notebook_module.write_file
+
+    def interrupted_write_file(path, *args, **kwargs):
+        # Simulate an import which is killed after completing `blog-with-jupyter` and whilst writing `test`.
+        if Path(path).parent.name == "test" and Path(path).name == "index.md":
+            raise KeyboardInterrupt
+        return write_file(path, *args, **kwargs)
+
+    monkeypatch.setattr(import_notebook_module, "write_file", interrupted_write_file)
+    with pytest.raises(KeyboardInterrupt):
+        import_notebook("tests/data/notebooks/*.ipynb", output_dir=str(tmp_path))
+    monkeypatch.undo()
+
+    completed_path = tmp_path / "blog-with-jupyter" / "index.md"
+    completed_path.write_text("completed")
+    assert (tmp_path / "test").is_dir()
+    assert not (tmp_path / "test" / "index.md").exists()
+    assert (tmp_path / JOURNAL_FILENAME).exists()
+
+    import_notebook("tests/data/notebooks/*.ipynb", output_dir=str(tmp_path), resume=True)
+
+    assert completed_path.read_text() == "completed"
+    assert (tmp_path / "test" / "index.md").is_file()
+    assert not (tmp_path / JOURNAL_FILENAME).exists()